@@ -3,21 +3,47 @@ Claude Skill Factory API
 
 The operator interface for submitting batches and querying results.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import JSONResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, HttpUrl
+from typing import Any, Optional
+import codecs
 import csv
-import io
+import orjson
 import uuid
 
 from src.queue.tasks import process_skill_batch
+from src.db.connection import get_pool, close_pool
 from src.db.models import BatchJob, BatchStatus
 
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson (much faster on large result sets)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Fill the DB pool before serving, drain it on shutdown."""
+    # If Postgres isn't up yet, serve anyway: the first request creates the pool
+    try:
+        await get_pool()
+    except Exception as e:
+        print(f"Database not ready, connecting on first request: {e}")
+    yield
+    await close_pool()
+
+
 app = FastAPI(
     title="Claude Skill Factory",
     description="Industrial-grade pipeline for processing data through Claude skills",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=OrjsonResponse
 )
 
 
@@ -25,7 +51,7 @@ class BatchSubmission(BaseModel):
     """Request to process a batch through a skill."""
     skill_name: str
     inputs: list[dict]
-    webhook_url: Optional[str] = None
+    webhook_url: Optional[HttpUrl] = None
 
 
 class BatchResponse(BaseModel):
@@ -48,18 +74,8 @@ async def root():
 @app.get("/skills")
 async def list_skills():
     """List all available skills."""
-    from src.skills.registry import SKILL_REGISTRY
-    return {
-        "skills": [
-            {
-                "name": name,
-                "description": skill.description,
-                "input_schema": skill.input_schema.model_json_schema(),
-                "output_schema": skill.output_schema.model_json_schema()
-            }
-            for name, skill in SKILL_REGISTRY.items()
-        ]
-    }
+    from src.skills.registry import get_skills_json
+    return Response(content=get_skills_json(), media_type="application/json")
 
 
 @app.post("/batch", response_model=BatchResponse)
@@ -84,7 +100,7 @@ async def submit_batch(submission: BatchSubmission):
         batch_id=batch_id,
         skill_name=submission.skill_name,
         inputs=submission.inputs,
-        webhook_url=submission.webhook_url
+        webhook_url=str(submission.webhook_url) if submission.webhook_url else None
     )
     
     return BatchResponse(
@@ -107,9 +123,10 @@ async def submit_csv_batch(skill_name: str, file: UploadFile):
     if skill_name not in SKILL_REGISTRY:
         raise HTTPException(status_code=400, detail=f"Unknown skill: {skill_name}")
     
-    content = await file.read()
-    reader = csv.DictReader(io.StringIO(content.decode('utf-8')))
-    inputs = list(reader)
+    # Parse rows straight off the spooled upload, decoding line by line,
+    # instead of holding the raw bytes and a decoded copy of the whole file
+    reader = csv.DictReader(codecs.iterdecode(file.file, 'utf-8'))
+    inputs = await run_in_threadpool(list, reader)
     
     if not inputs:
         raise HTTPException(status_code=400, detail="CSV file is empty")
@@ -152,7 +169,9 @@ async def get_batch_status(batch_id: str):
     if status["status"] == "completed":
         response["results"] = await get_batch_results(batch_id)
     
-    return response
+    # Already plain JSON types: skip FastAPI's jsonable_encoder walk over
+    # potentially thousands of result dicts
+    return OrjsonResponse(response)
 
 
 @app.get("/health")
@@ -3,7 +3,8 @@ Database Models
 
 SQLAlchemy models for batch jobs and results.
 """
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, JSON, Enum, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, Enum, ForeignKey, Index, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
 from enum import Enum as PyEnum
@@ -30,20 +31,46 @@ class BatchJob(Base):
     total_items = Column(Integer, default=0)
     completed_items = Column(Integer, default=0)
     failed_items = Column(Integer, default=0)
+    webhook_url = Column(String, nullable=True)
+    webhook_sent_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     items = relationship("BatchItem", back_populates="job")
 
 
+# NOTIFY batch_completed <batch id> when a batch with a webhook completes,
+# picked up by the webhook notifier (src.queue.notifier)
+event.listen(BatchJob.__table__, "after_create", DDL("""
+CREATE OR REPLACE FUNCTION notify_batch_completed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('batch_completed', NEW.id);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""))
+event.listen(BatchJob.__table__, "after_create", DDL("""
+CREATE TRIGGER batch_jobs_notify_completed
+AFTER UPDATE OF status ON batch_jobs
+FOR EACH ROW
+WHEN (NEW.status = 'completed' AND OLD.status IS DISTINCT FROM NEW.status AND NEW.webhook_url IS NOT NULL)
+EXECUTE FUNCTION notify_batch_completed()
+"""))
+
+
 class BatchItem(Base):
     """A single item within a batch."""
     __tablename__ = "batch_items"
+    __table_args__ = (
+        # Postgres doesn't index foreign keys: without this, fetching a
+        # batch's results scans the whole table
+        Index("ix_batch_items_batch_id", "batch_id"),
+    )
     
     id = Column(String, primary_key=True)
     batch_id = Column(String, ForeignKey("batch_jobs.id"), nullable=False)
-    input_data = Column(JSON, nullable=False)
-    output_data = Column(JSON, nullable=True)
+    input_data = Column(JSONB, nullable=False)
+    output_data = Column(JSONB, nullable=True)
     success = Column(Boolean, nullable=True)
     error_type = Column(String, nullable=True)
     error_message = Column(String, nullable=True)
@@ -23,8 +23,13 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     
-    # Rate limiting - be nice to Anthropic API
-    task_default_rate_limit="10/s",
+    # Rate limiting is done in front of the Anthropic client instead
+    # (src.skills.rate_limit), shared by every worker
+    
+    # Thread pool: tasks block on the shared per-process event loop
+    # (src.queue.event_loop), so one process keeps this many items in flight
+    worker_pool="threads",
+    worker_concurrency=int(os.getenv("WORKER_CONCURRENCY", "50")),
     
     # Retry configuration
     task_acks_late=True,
@@ -0,0 +1,40 @@
+"""
+Worker Event Loop
+
+One long-lived asyncio loop per worker process, running in a background
+thread. Celery tasks stay sync and hand their coroutines to it, so a
+thread-pool worker keeps many Claude calls in flight on a single loop
+(sharing one DB pool and one HTTP client) instead of each task driving
+its own loop and blocking on every request.
+"""
+import asyncio
+import os
+import threading
+from typing import Any, Coroutine
+
+try:
+    import uvloop  # installed with uvicorn[standard]
+    new_event_loop = uvloop.new_event_loop
+except ImportError:
+    new_event_loop = asyncio.new_event_loop
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_pid: int | None = None
+_lock = threading.Lock()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """Get this process's worker loop, starting it on first use."""
+    global _loop, _loop_pid
+    with _lock:
+        # A forked child inherits the object but not the thread running it
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="worker-event-loop", daemon=True).start()
+        return _loop
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on the worker loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
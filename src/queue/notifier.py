@@ -0,0 +1,88 @@
+"""
+Webhook Notifier
+
+Long-lived listener that sends batch completion webhooks. When
+update_batch_item flips a batch with a webhook to completed, a trigger on
+batch_jobs fires NOTIFY batch_completed with the batch id, so nothing
+polls the database while batches run.
+
+A failed send is retried with exponential backoff, starting at
+WEBHOOK_RETRY_DELAY seconds, up to WEBHOOK_MAX_ATTEMPTS tries. After
+that it stays pending until the notifier next starts.
+
+Run with: python -m src.queue.notifier
+"""
+import asyncio
+import os
+
+import asyncpg
+import httpx
+
+from src.db.connection import DATABASE_URL, claim_webhook, get_pending_webhooks, release_webhook
+
+CHANNEL = "batch_completed"
+
+WEBHOOK_RETRY_DELAY = float(os.getenv("WEBHOOK_RETRY_DELAY", "30"))
+WEBHOOK_MAX_ATTEMPTS = int(os.getenv("WEBHOOK_MAX_ATTEMPTS", "8"))
+
+
+async def send_webhook(client: httpx.AsyncClient, batch_id: str) -> bool:
+    """
+    Send the completion webhook for a batch, unless already sent.
+
+    Returns False if the send failed and the webhook is pending again.
+    """
+    batch = await claim_webhook(batch_id)
+    if not batch:
+        return True
+
+    try:
+        response = await client.post(batch["webhook_url"], json={
+            "batch_id": batch_id,
+            "status": "completed",
+            "total": batch["total"],
+            "completed": batch["completed"],
+            "failed": batch["failed"]
+        })
+        response.raise_for_status()
+    except Exception as e:
+        # Not sent after all, whatever went wrong: release the claim so a
+        # bad URL can't stop the listener or lose the webhook
+        await release_webhook(batch_id)
+        print(f"Webhook notification failed for batch {batch_id}: {e!r}")
+        return False
+    return True
+
+
+async def listen():
+    """Send webhooks as batches complete. Returns only if the connection drops."""
+    completed: asyncio.Queue[str | None] = asyncio.Queue()
+    attempts: dict[str, int] = {}
+    loop = asyncio.get_running_loop()
+
+    # LISTEN needs its own connection, held for the life of the process
+    conn = await asyncpg.connect(DATABASE_URL)
+    conn.add_termination_listener(lambda conn: completed.put_nowait(None))
+    await conn.add_listener(CHANNEL, lambda conn, pid, channel, batch_id: completed.put_nowait(batch_id))
+
+    # Catch up on batches that completed while nobody was listening
+    for batch_id in await get_pending_webhooks():
+        completed.put_nowait(batch_id)
+
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        while (batch_id := await completed.get()) is not None:
+            if await send_webhook(client, batch_id):
+                attempts.pop(batch_id, None)
+                continue
+
+            attempt = attempts[batch_id] = attempts.get(batch_id, 0) + 1
+            if attempt < WEBHOOK_MAX_ATTEMPTS:
+                loop.call_later(WEBHOOK_RETRY_DELAY * 2 ** (attempt - 1), completed.put_nowait, batch_id)
+            else:
+                del attempts[batch_id]
+                print(f"Giving up on webhook for batch {batch_id} until the notifier restarts")
+
+
+if __name__ == "__main__":
+    asyncio.run(listen())
+    raise SystemExit("Lost database connection")
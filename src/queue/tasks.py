@@ -5,14 +5,92 @@ Batch processing tasks with rate limiting and error handling.
 """
 import asyncio
 from celery import group
+from celery.concurrency import get_implementation
+from celery.concurrency.thread import TaskPool as ThreadTaskPool
+from celery.signals import worker_init, worker_process_init
 from src.queue.celery_app import celery_app
-from src.skills.registry import get_skill
+from src.queue.event_loop import run
+from src.redis_client import get_redis
+from src.skills.registry import get_skill, warm_up_skills
+from src.skills.claude_client import get_client
 from src.db.connection import (
-    create_batch_job, 
-    create_batch_item,
+    get_pool,
+    create_batch_job,
+    create_batch_items,
     update_batch_item,
     update_batch_job_status
 )
+from src.db.models import BatchStatus
+
+
+async def _warm_up():
+    """
+    Fill the DB pool and build the shared clients before the first task.
+    
+    Best effort: if Postgres or Redis isn't up yet (e.g. a cold
+    docker-compose up), the worker still starts and the first task
+    connects lazily.
+    """
+    get_client()
+    warm_up_skills()
+    
+    try:
+        await get_pool()
+    except Exception as e:
+        print(f"Database not ready, connecting on first task: {e}")
+    
+    try:
+        await get_redis().ping()
+    except Exception as e:
+        print(f"Redis not ready, connecting on first task: {e}")
+
+
+@worker_init.connect
+def warm_up_thread_worker(sender=None, **kwargs):
+    """Thread pool: tasks run in this process, so warm it up now."""
+    # Prefork children warm up in worker_process_init instead; a loop
+    # started here would not survive the fork
+    if get_implementation(sender.pool_cls) is ThreadTaskPool:
+        run(_warm_up())
+
+
+@worker_process_init.connect
+def warm_up_child_process(**kwargs):
+    """Prefork/solo pool: warm up each process that runs tasks."""
+    run(_warm_up())
+
+
+# Items are written and enqueued in chunks of this size
+DISPATCH_CHUNK_SIZE = 500
+
+
+async def _queue_batch_items(batch_id: str, skill_name: str, inputs: list[dict]) -> None:
+    """
+    Write batch items and enqueue their tasks as an overlapping pipeline.
+
+    While chunk N is being sent to the broker (blocking, so off-loop in a
+    thread), chunk N+1 is being COPYed into Postgres. A chunk is only
+    enqueued after its rows are committed, so workers never race the insert.
+    """
+    loop = asyncio.get_running_loop()
+    sending = None
+
+    for start in range(0, len(inputs), DISPATCH_CHUNK_SIZE):
+        chunk = inputs[start:start + DISPATCH_CHUNK_SIZE]
+        writing = create_batch_items(batch_id, chunk, start=start)
+        if sending:
+            item_ids, _ = await asyncio.gather(writing, sending)
+        else:
+            item_ids = await writing
+
+        tasks = group([
+            process_single_item.s(batch_id, item_id, skill_name, input_data)
+            for item_id, input_data in zip(item_ids, chunk)
+        ])
+        sending = loop.run_in_executor(None, tasks.apply_async)
+
+    if sending:
+        await sending
 
 
 @celery_app.task(bind=True, max_retries=3, default_retry_delay=60)
@@ -26,32 +104,24 @@ def process_skill_batch(self, batch_id: str, skill_name: str, inputs: list[dict]
     if not skill:
         raise ValueError(f"Unknown skill: {skill_name}")
     
-    # Run async setup in sync context
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(create_batch_job(batch_id, skill_name, len(inputs)))
+    # Run async setup on the worker loop. The optional webhook is stored on
+    # the job and sent by src.queue.notifier once the batch completes
+    run(create_batch_job(batch_id, skill_name, len(inputs), webhook_url))
     
-    # Queue individual items
-    tasks = []
-    for i, input_data in enumerate(inputs):
-        item_id = f"{batch_id}:{i}"
-        loop.run_until_complete(create_batch_item(batch_id, item_id, input_data))
-        tasks.append(process_single_item.s(batch_id, item_id, skill_name, input_data))
-    
-    # Execute all items (Celery will handle rate limiting)
-    job = group(tasks)
-    result = job.apply_async()
-    
-    # Optional: webhook notification when complete
-    if webhook_url:
-        notify_completion.apply_async(
-            args=[batch_id, webhook_url],
-            countdown=10  # Check after initial burst
-        )
+    # Write and queue items chunk by chunk. Chunks already sent can't be
+    # taken back, so on failure (including a redelivered task hitting the
+    # items it wrote last time) the batch is marked failed rather than
+    # left processing forever
+    try:
+        run(_queue_batch_items(batch_id, skill_name, inputs))
+    except Exception:
+        run(update_batch_job_status(batch_id, BatchStatus.FAILED))
+        raise
     
     return {"batch_id": batch_id, "items_queued": len(inputs)}
 
 
-@celery_app.task(bind=True, max_retries=5, rate_limit="10/s")
+@celery_app.task(bind=True, max_retries=5)
 def process_single_item(self, batch_id: str, item_id: str, skill_name: str, input_data: dict):
     """
     Process a single item through a skill.
@@ -64,9 +134,8 @@ def process_single_item(self, batch_id: str, item_id: str, skill_name: str, inpu
     if not skill:
         raise ValueError(f"Unknown skill: {skill_name}")
     
-    # Run the skill
-    loop = asyncio.get_event_loop()
-    result = loop.run_until_complete(skill.run(input_data))
+    # Run the skill (other worker threads keep their calls in flight meanwhile)
+    result = run(skill.run(input_data))
     
     # Handle retryable errors
     if not result.success and result.error_type == SkillErrorType.RATE_LIMIT:
@@ -76,7 +145,7 @@ def process_single_item(self, batch_id: str, item_id: str, skill_name: str, inpu
         raise self.retry(exc=Exception(result.error_message), countdown=10)
     
     # Store result
-    loop.run_until_complete(update_batch_item(
+    run(update_batch_item(
         batch_id=batch_id,
         item_id=item_id,
         success=result.success,
@@ -93,31 +162,3 @@ def process_single_item(self, batch_id: str, item_id: str, skill_name: str, inpu
         "error_type": result.error_type.value if result.error_type else None
     }
 
-
-@celery_app.task
-def notify_completion(batch_id: str, webhook_url: str):
-    """Send webhook notification when batch completes."""
-    import httpx
-    
-    loop = asyncio.get_event_loop()
-    
-    # Check if batch is complete
-    from src.db.connection import get_batch_status
-    status = loop.run_until_complete(get_batch_status(batch_id))
-    
-    if status and status["status"] == "completed":
-        # Send webhook
-        try:
-            with httpx.Client() as client:
-                client.post(webhook_url, json={
-                    "batch_id": batch_id,
-                    "status": "completed",
-                    "total": status["total"],
-                    "completed": status["completed"],
-                    "failed": status["failed"]
-                })
-        except Exception as e:
-            print(f"Webhook notification failed: {e}")
-    else:
-        # Recheck in 30 seconds
-        notify_completion.apply_async(args=[batch_id, webhook_url], countdown=30)
@@ -0,0 +1,21 @@
+"""
+Redis Client
+
+Process-wide async Redis client, shared by the rate limiter, the result
+cache and worker warm-up.
+"""
+import os
+
+import redis.asyncio as redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+_redis: redis.Redis | None = None
+
+
+def get_redis() -> redis.Redis:
+    """Get the process-wide async Redis client."""
+    global _redis
+    if _redis is None:
+        _redis = redis.from_url(REDIS_URL)
+    return _redis
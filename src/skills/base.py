@@ -80,6 +80,14 @@ class BaseSkill(ABC):
         """
         pass
     
+    def warm_up(self) -> None:
+        """
+        Build any process-wide clients the skill uses.
+        
+        Workers call this at startup so the first task doesn't pay for it.
+        """
+        pass
+    
     async def run(self, raw_input: dict) -> SkillResult:
         """
         Full pipeline: validate input → execute → validate output.
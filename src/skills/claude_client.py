@@ -2,96 +2,207 @@
 Claude API Client
 
 Handles structured output extraction from Claude.
-Uses JSON mode + Pydantic validation (not instructor, to keep deps minimal).
+Uses forced tool calls (JSON prompt as fallback) + Pydantic validation
+(not instructor, to keep deps minimal).
 """
 import os
 import json
+from functools import lru_cache
 import anthropic
-from pydantic import BaseModel
+import httpx
+from pydantic import BaseModel, ValidationError
 from typing import Type
 
 from src.skills.base import SkillResult, SkillErrorType
+from src.skills.rate_limit import wait_for_capacity
 
 
-# Initialize client (uses ANTHROPIC_API_KEY env var)
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+
+# Claude is forced to answer through this tool (see call_claude_structured)
+EMIT_TOOL_NAME = "emit"
+
+_client: anthropic.AsyncAnthropic | None = None
+
+
+# Initialize client once per process (uses ANTHROPIC_API_KEY env var), so
+# every call shares one keep-alive HTTP/2 connection pool
 def get_client() -> anthropic.AsyncAnthropic:
-    return anthropic.AsyncAnthropic()
+    global _client
+    if _client is None:
+        _client = anthropic.AsyncAnthropic(
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=100)
+            )
+        )
+    return _client
+
+
+def _count_tokens(usage) -> int:
+    """Total tokens for a call; prompt-cache reads/writes are reported separately."""
+    return (
+        usage.input_tokens
+        + usage.output_tokens
+        + (usage.cache_creation_input_tokens or 0)
+        + (usage.cache_read_input_tokens or 0)
+    )
+
+
+@lru_cache(maxsize=64)
+def _emit_tool(output_schema: Type[BaseModel]) -> dict:
+    """Tool definition whose input is the output schema, built once per schema."""
+    return {
+        "name": EMIT_TOOL_NAME,
+        "description": "Record the structured result. Call this exactly once with the complete result.",
+        "input_schema": output_schema.model_json_schema()
+    }
+
+
+@lru_cache(maxsize=64)
+def _json_instruction(output_schema: Type[BaseModel]) -> str:
+    """JSON-only instruction plus schema, built once per output schema."""
+    return f"""
+
+IMPORTANT: Respond with ONLY valid JSON. No markdown, no explanation, no code blocks.
+The JSON must match this schema:
+{json.dumps(output_schema.model_json_schema(), indent=2)}"""
+
+
+def _parse_tool_response(response, output_schema: Type[BaseModel]) -> SkillResult:
+    """Validate the input of the forced `emit` tool call."""
+    tokens_used = _count_tokens(response.usage)
+    
+    tool_call = next((block for block in response.content if block.type == "tool_use"), None)
+    if tool_call is None:
+        return SkillResult(
+            success=False,
+            output=None,
+            error_type=SkillErrorType.VALIDATION_OUTPUT,
+            error_message=f"Claude did not call the {EMIT_TOOL_NAME} tool",
+            tokens_used=tokens_used
+        )
+    
+    try:
+        validated = output_schema.model_validate(tool_call.input)
+        return SkillResult(
+            success=True,
+            output=validated.model_dump(),
+            tokens_used=tokens_used
+        )
+    except ValidationError as e:
+        return SkillResult(
+            success=False,
+            output=tool_call.input,
+            error_type=SkillErrorType.VALIDATION_OUTPUT,
+            error_message=f"Schema validation failed: {str(e)}",
+            tokens_used=tokens_used
+        )
+
+
+def _parse_text_response(response, output_schema: Type[BaseModel]) -> SkillResult:
+    """Parse and validate a plain-text JSON reply."""
+    tokens_used = _count_tokens(response.usage)
+    
+    # Extract text content
+    raw_text = response.content[0].text.strip()
+    
+    # Try to parse JSON (handle markdown code blocks if model ignores instruction)
+    if raw_text.startswith("```"):
+        # Strip markdown code block
+        lines = raw_text.split("\n")
+        raw_text = "\n".join(lines[1:-1])
+    
+    # Validate straight from the JSON text: pydantic-core parses and
+    # validates in one pass, no json.loads + dict walk on the happy path
+    try:
+        validated = output_schema.model_validate_json(raw_text)
+        return SkillResult(
+            success=True,
+            output=validated.model_dump(),
+            tokens_used=tokens_used
+        )
+    except ValidationError as e:
+        validation_error = e
+    
+    # Failed: parse to a dict only now, to keep the raw output for debugging
+    try:
+        parsed = json.loads(raw_text)
+    except json.JSONDecodeError as e:
+        return SkillResult(
+            success=False,
+            output={"raw_response": raw_text},
+            error_type=SkillErrorType.VALIDATION_OUTPUT,
+            error_message=f"Invalid JSON from Claude: {str(e)}",
+            tokens_used=tokens_used
+        )
+    
+    return SkillResult(
+        success=False,
+        output=parsed,
+        error_type=SkillErrorType.VALIDATION_OUTPUT,
+        error_message=f"Schema validation failed: {str(validation_error)}",
+        tokens_used=tokens_used
+    )
 
 
 async def call_claude_structured(
     prompt: str,
     output_schema: Type[BaseModel],
     system_prompt: str | None = None,
-    model: str = "claude-sonnet-4-20250514",
+    model: str = DEFAULT_MODEL,
     max_tokens: int = 4096,
-    temperature: float = 0.0
+    temperature: float = 0.0,
+    use_tools: bool = True
 ) -> SkillResult:
     """
     Call Claude and parse response into a Pydantic model.
     
     Uses low temperature for consistency.
     Validates output against schema.
+    
+    By default the output schema is offered as a tool Claude is forced to
+    call, so the reply arrives as parsed JSON. With use_tools=False (for
+    models without tool support) the schema goes in the system prompt and
+    the text reply is parsed instead.
     """
     client = get_client()
     
     # Build messages
     messages = [{"role": "user", "content": prompt}]
     
-    # Add JSON instruction to system prompt
-    json_instruction = f"""
-
-IMPORTANT: Respond with ONLY valid JSON. No markdown, no explanation, no code blocks.
-The JSON must match this schema:
-{json.dumps(output_schema.model_json_schema(), indent=2)}"""
+    if use_tools:
+        request = {
+            "tools": [_emit_tool(output_schema)],
+            "tool_choice": {"type": "tool", "name": EMIT_TOOL_NAME}
+        }
+        system_text = system_prompt
+    else:
+        # Add JSON instruction to system prompt
+        request = {}
+        system_text = (system_prompt or "") + _json_instruction(output_schema)
+    
+    # Tools and system prompt are identical for every item in a batch, so
+    # mark them cacheable: repeat calls read them from Anthropic's prompt
+    # cache instead of reprocessing them
+    if system_text:
+        request["system"] = [{
+            "type": "text",
+            "text": system_text,
+            "cache_control": {"type": "ephemeral"}
+        }]
     
-    full_system = (system_prompt or "") + json_instruction
+    # Shared across all workers; reserves max_tokens against the TPM budget
+    await wait_for_capacity(max_tokens)
     
     try:
         response = await client.messages.create(
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
-            system=full_system,
-            messages=messages
+            messages=messages,
+            **request
         )
-        
-        # Extract text content
-        raw_text = response.content[0].text.strip()
-        
-        # Try to parse JSON (handle markdown code blocks if model ignores instruction)
-        if raw_text.startswith("```"):
-            # Strip markdown code block
-            lines = raw_text.split("\n")
-            raw_text = "\n".join(lines[1:-1])
-        
-        try:
-            parsed = json.loads(raw_text)
-        except json.JSONDecodeError as e:
-            return SkillResult(
-                success=False,
-                output={"raw_response": raw_text},
-                error_type=SkillErrorType.VALIDATION_OUTPUT,
-                error_message=f"Invalid JSON from Claude: {str(e)}",
-                tokens_used=response.usage.input_tokens + response.usage.output_tokens
-            )
-        
-        # Validate against schema
-        try:
-            validated = output_schema.model_validate(parsed)
-            return SkillResult(
-                success=True,
-                output=validated.model_dump(),
-                tokens_used=response.usage.input_tokens + response.usage.output_tokens
-            )
-        except Exception as e:
-            return SkillResult(
-                success=False,
-                output=parsed,
-                error_type=SkillErrorType.VALIDATION_OUTPUT,
-                error_message=f"Schema validation failed: {str(e)}",
-                tokens_used=response.usage.input_tokens + response.usage.output_tokens
-            )
-            
     except anthropic.RateLimitError as e:
         return SkillResult(
             success=False,
@@ -106,3 +217,7 @@ The JSON must match this schema:
             error_type=SkillErrorType.API_ERROR,
             error_message=str(e)
         )
+    
+    if use_tools:
+        return _parse_tool_response(response, output_schema)
+    return _parse_text_response(response, output_schema)
@@ -0,0 +1,100 @@
+"""
+Anthropic Rate Limiting
+
+Token buckets in Redis, shared by every worker process, in front of each
+Claude call. Celery's per-task rate_limit only throttled how fast tasks
+were started in one worker; these buckets bound what actually reaches
+the API, retries included.
+
+Two buckets:
+- requests: refills at ANTHROPIC_RPM / 60 per second, holds up to
+  ANTHROPIC_BURST requests (the in-flight target). Disabled if
+  ANTHROPIC_RPM is 0.
+- tokens:   refills at ANTHROPIC_TPM / 60 per second, each call reserves
+  its max_tokens. Disabled unless ANTHROPIC_TPM is set.
+
+Like the result cache, the limiter is best effort: if Redis is
+unavailable, calls go ahead unthrottled rather than failing.
+"""
+import asyncio
+import os
+
+import redis
+
+from src.redis_client import get_redis
+
+ANTHROPIC_RPM = int(os.getenv("ANTHROPIC_RPM", "600"))
+ANTHROPIC_BURST = int(os.getenv("ANTHROPIC_BURST", "10"))
+ANTHROPIC_TPM = int(os.getenv("ANTHROPIC_TPM", "0"))
+
+# Refill from elapsed server time, then take `requested` if available.
+# Returns "0" on success, otherwise the seconds to wait before retrying.
+# Uses Redis TIME so worker clock skew doesn't matter.
+_TOKEN_BUCKET_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = math.min(tonumber(ARGV[3]), capacity)
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+class TokenBucket:
+    """A token bucket stored in Redis, shared across processes."""
+
+    def __init__(self, key: str, capacity: int, per_minute: int):
+        # The Lua script divides by both to compute waits and expiry
+        if capacity <= 0 or per_minute <= 0:
+            raise ValueError(f"{key}: capacity and per_minute must be positive")
+        self.key = key
+        self.capacity = capacity
+        self.rate = per_minute / 60
+        self._script = None
+
+    async def acquire(self, amount: int = 1) -> None:
+        """Wait until `amount` tokens are available, then take them."""
+        if self._script is None:
+            self._script = get_redis().register_script(_TOKEN_BUCKET_LUA)
+
+        while True:
+            wait = float(await self._script(keys=[self.key], args=[self.capacity, self.rate, amount]))
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+
+request_bucket = (
+    TokenBucket("ratelimit:anthropic:requests", ANTHROPIC_BURST, ANTHROPIC_RPM)
+    if ANTHROPIC_RPM else None
+)
+token_bucket = (
+    TokenBucket("ratelimit:anthropic:tokens", ANTHROPIC_TPM, ANTHROPIC_TPM)
+    if ANTHROPIC_TPM else None
+)
+
+
+async def wait_for_capacity(max_tokens: int) -> None:
+    """Block until one request of up to `max_tokens` fits within the limits."""
+    try:
+        if request_bucket:
+            await request_bucket.acquire()
+        if token_bucket:
+            await token_bucket.acquire(max_tokens)
+    except redis.RedisError as e:
+        print(f"Rate limiter unavailable, not throttling: {e}")
@@ -4,6 +4,8 @@ Skill Registry
 Central registry of all available skills.
 New skills are added here to be discoverable by the API.
 """
+import orjson
+
 from src.skills.base import BaseSkill
 from src.skills.url_summarizer import url_summarizer
 
@@ -14,6 +16,33 @@ SKILL_REGISTRY: dict[str, BaseSkill] = {
 }
 
 
+def describe_skill(skill: BaseSkill) -> dict:
+    """Public description of a skill, including its JSON schemas."""
+    return {
+        "name": skill.name,
+        "description": skill.description,
+        "input_schema": skill.input_schema.model_json_schema(),
+        "output_schema": skill.output_schema.model_json_schema()
+    }
+
+
+# Schemas are fixed per process, so generate them once, not per request
+SKILL_SCHEMAS: dict[str, dict] = {
+    name: describe_skill(skill) for name, skill in SKILL_REGISTRY.items()
+}
+
+# Serialized GET /skills payload, rebuilt lazily after register_skill
+_skills_json: bytes | None = None
+
+
+def get_skills_json() -> bytes:
+    """Get the GET /skills response body, serialized once."""
+    global _skills_json
+    if _skills_json is None:
+        _skills_json = orjson.dumps({"skills": list(SKILL_SCHEMAS.values())})
+    return _skills_json
+
+
 def get_skill(name: str) -> BaseSkill | None:
     """Get a skill by name."""
     return SKILL_REGISTRY.get(name)
@@ -21,7 +50,16 @@ def get_skill(name: str) -> BaseSkill | None:
 
 def register_skill(skill: BaseSkill) -> None:
     """Register a new skill."""
+    global _skills_json
     SKILL_REGISTRY[skill.name] = skill
+    SKILL_SCHEMAS[skill.name] = describe_skill(skill)
+    _skills_json = None
+
+
+def warm_up_skills() -> None:
+    """Let every registered skill build its clients."""
+    for skill in SKILL_REGISTRY.values():
+        skill.warm_up()
 
 
 def list_skills() -> list[str]:
@@ -0,0 +1,41 @@
+"""
+Skill Result Cache
+
+Redis TTL cache for skill outputs. For skills that are a pure function of
+their input (plus model and prompt), a repeated input returns the stored
+output instead of paying for another Claude call.
+
+The cache is best effort: if Redis is unavailable it behaves as a miss.
+"""
+import hashlib
+import os
+
+import orjson
+import redis
+
+from src.redis_client import get_redis
+
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "86400"))  # 24 hours
+
+
+def cache_key(*parts: str) -> str:
+    """Build a fixed-length key from everything the output depends on."""
+    digest = hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+    return f"skillcache:{digest}"
+
+
+async def get_cached(key: str) -> dict | None:
+    """Get a cached output, or None on a miss."""
+    try:
+        raw = await get_redis().get(key)
+    except redis.RedisError:
+        return None
+    return orjson.loads(raw) if raw else None
+
+
+async def set_cached(key: str, output: dict) -> None:
+    """Store an output for RESULT_CACHE_TTL seconds."""
+    try:
+        await get_redis().set(key, orjson.dumps(output), ex=RESULT_CACHE_TTL)
+    except redis.RedisError:
+        pass
@@ -6,10 +6,48 @@ This proves the full pipeline works.
 """
 from pydantic import BaseModel, Field, HttpUrl
 from typing import Optional
+import json
+import re
 import httpx
+from selectolax.lexbor import LexborHTMLParser
 
 from src.skills.base import BaseSkill, SkillResult, SkillErrorType
-from src.skills.claude_client import call_claude_structured
+from src.skills.claude_client import DEFAULT_MODEL, EMIT_TOOL_NAME, call_claude_structured
+from src.skills.result_cache import cache_key, get_cached, set_cached
+
+# Content sent to Claude. Extracted text is dense, so this holds far more
+# of the page than the same budget of raw HTML did
+MAX_CONTENT_CHARS = 20000
+
+# Raw HTML parsed per page. Parsing runs on the worker's shared event loop,
+# so an unbounded page would stall every other call in flight
+MAX_HTML_CHARS = 300_000
+
+_WHITESPACE = re.compile(r"\s+")
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide client used to fetch pages (keeps connections alive)."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(http2=True, follow_redirects=True, timeout=30.0)
+    return _http_client
+
+
+def extract_text(html: str) -> str:
+    """Visible text of an HTML page, title first, whitespace collapsed."""
+    tree = LexborHTMLParser(html[:MAX_HTML_CHARS])
+    tree.strip_tags(["script", "style", "noscript", "svg", "template"])
+    
+    root = tree.body or tree.root
+    text = _WHITESPACE.sub(" ", root.text(separator=" ", strip=True)) if root else ""
+    
+    title = tree.css_first("title")
+    if title:
+        text = f"{_WHITESPACE.sub(' ', title.text(strip=True))}\n\n{text}"
+    return text
 
 
 class UrlSummarizerInput(BaseModel):
@@ -28,6 +66,19 @@ class UrlSummarizerOutput(BaseModel):
     language: str = Field(description="Detected language code (en, es, etc)")
 
 
+# Cached summaries are only valid for the prompt and schema that made them
+_PROMPT_TEMPLATE = """Analyze this webpage content and provide a structured summary.
+
+URL: {url}
+
+CONTENT:
+{content}
+
+Call the {tool} tool with the summary; its field descriptions say what each field holds."""
+
+_OUTPUT_SCHEMA_JSON = json.dumps(UrlSummarizerOutput.model_json_schema(), sort_keys=True)
+
+
 class UrlSummarizerSkill(BaseSkill):
     """
     Skill: Given a URL, fetch it and produce a structured summary.
@@ -40,23 +91,39 @@ class UrlSummarizerSkill(BaseSkill):
     input_schema = UrlSummarizerInput
     output_schema = UrlSummarizerOutput
     
-    system_prompt = """You are a content analyzer. Given webpage content, extract structured information.
+    system_prompt = f"""You are a content analyzer. Given webpage content, extract structured information.
 
 Be factual and concise. If content is unclear or missing, make reasonable inferences but note uncertainty.
 
-Always respond with valid JSON matching the exact schema requested."""
+Always record your answer by calling the {EMIT_TOOL_NAME} tool."""
 
+    def warm_up(self) -> None:
+        """Create the page-fetch client."""
+        get_http_client()
+    
     async def execute(self, validated_input: UrlSummarizerInput) -> SkillResult:
         """Fetch URL content and summarize with Claude."""
         
         url = str(validated_input.url)
         
+        # Same URL, model, prompts and schema give the same summary: skip fetch and Claude
+        key = cache_key(
+            self.name, url, DEFAULT_MODEL, self.system_prompt, _PROMPT_TEMPLATE, _OUTPUT_SCHEMA_JSON
+        )
+        cached = await get_cached(key)
+        if cached is not None:
+            return SkillResult(success=True, output=cached)
+        
         # Step 1: Fetch the URL
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-                content = response.text[:50000]  # Limit content size
+            response = await get_http_client().get(url)
+            response.raise_for_status()
+            # Send page text, not markup: nav, CSS and JS would eat the budget
+            if "html" in response.headers.get("content-type", ""):
+                content = extract_text(response.text)
+            else:
+                content = response.text
+            content = content[:MAX_CONTENT_CHARS]  # Limit content size
         except httpx.TimeoutException:
             return SkillResult(
                 success=False,
@@ -73,21 +140,7 @@ Always respond with valid JSON matching the exact schema requested."""
             )
         
         # Step 2: Call Claude for structured summary
-        prompt = f"""Analyze this webpage content and provide a structured summary.
-
-URL: {url}
-
-CONTENT:
-{content}
-
-Respond with JSON matching this exact structure:
-- url: the original URL
-- title: page title or inferred title
-- summary: 2-3 sentence summary
-- key_points: array of 3-5 key points
-- content_type: one of (article, product, documentation, blog, other)
-- word_count_estimate: estimated word count
-- language: language code (en, es, etc)"""
+        prompt = _PROMPT_TEMPLATE.format(url=url, content=content, tool=EMIT_TOOL_NAME)
 
         result = await call_claude_structured(
             prompt=prompt,
@@ -95,6 +148,9 @@ Respond with JSON matching this exact structure:
             system_prompt=self.system_prompt
         )
         
+        if result.success:
+            await set_cached(key, result.output)
+        
         return result
 
 
@@ -0,0 +1,21 @@
+"""
+Shared test fixtures.
+"""
+import fakeredis
+import pytest
+
+from src import redis_client
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point get_redis at a fresh in-memory server (needs fakeredis[lua])."""
+    client = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(redis_client, "_redis", client)
+    return client
+
+
+@pytest.fixture
+def redis_down(monkeypatch):
+    """Point get_redis at a server that refuses every command."""
+    monkeypatch.setattr(redis_client, "_redis", fakeredis.FakeAsyncRedis(connected=False))
@@ -0,0 +1,33 @@
+"""
+Tests for the Redis skill result cache, against fakeredis.
+
+Run with: pytest tests/ -v
+"""
+import pytest
+
+from src.skills.result_cache import RESULT_CACHE_TTL, cache_key, get_cached, set_cached
+
+
+class TestResultCache:
+    """Test cache hits, misses and keys."""
+    
+    def test_key_depends_on_every_part(self):
+        key = cache_key("url_summarizer", "https://example.com/", "prompt v1")
+        assert key == cache_key("url_summarizer", "https://example.com/", "prompt v1")
+        assert key != cache_key("url_summarizer", "https://example.com/", "prompt v2")
+    
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, fake_redis):
+        key = cache_key("url_summarizer", "https://example.com/")
+        assert await get_cached(key) is None
+        
+        await set_cached(key, {"title": "Example", "key_points": ["a", "b"]})
+        assert await get_cached(key) == {"title": "Example", "key_points": ["a", "b"]}
+        assert 0 < await fake_redis.ttl(key) <= RESULT_CACHE_TTL
+    
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("redis_down")
+    async def test_redis_down_is_a_miss(self):
+        key = cache_key("url_summarizer", "https://example.com/")
+        await set_cached(key, {"title": "Example"})
+        assert await get_cached(key) is None
@@ -0,0 +1,33 @@
+"""
+Tests for skill results.
+
+Kept apart from the schema tests so SkillResult-only runs don't load the
+skill modules (HTTP client, HTML parser, Claude client).
+
+Run with: pytest tests/ -v
+"""
+from src.skills.base import SkillResult, SkillErrorType
+
+
+class TestSkillResult:
+    """Test SkillResult dataclass."""
+    
+    def test_success_result(self):
+        result = SkillResult(
+            success=True,
+            output={"key": "value"},
+            tokens_used=100,
+            latency_ms=500
+        )
+        assert result.success
+        assert result.error_type is None
+    
+    def test_failure_result(self):
+        result = SkillResult(
+            success=False,
+            output=None,
+            error_type=SkillErrorType.VALIDATION_INPUT,
+            error_message="Invalid input"
+        )
+        assert not result.success
+        assert result.error_type == SkillErrorType.VALIDATION_INPUT
@@ -3,73 +3,149 @@ Tests for the skill factory.
 
 Run with: pytest tests/ -v
 """
+import json
+from types import SimpleNamespace
+
 import pytest
-from pydantic import BaseModel
+from pydantic import ValidationError
+
+from src.skills.base import SkillErrorType
+from src.skills.claude_client import _parse_text_response, _parse_tool_response
+from src.skills.url_summarizer import (
+    MAX_HTML_CHARS,
+    UrlSummarizerInput,
+    UrlSummarizerOutput,
+    extract_text
+)
+
+# Compiled schema validators, bound once for the whole module
+_IN_V = UrlSummarizerInput.__pydantic_validator__
+_OUT_V = UrlSummarizerOutput.__pydantic_validator__
+
+_EXPECTED_STR = "https://example.com/page"
+
+
+def _stub_response(*content):
+    """Minimal stand-in for an Anthropic Message: content blocks and usage."""
+    usage = SimpleNamespace(
+        input_tokens=100,
+        output_tokens=20,
+        cache_creation_input_tokens=None,
+        cache_read_input_tokens=None
+    )
+    return SimpleNamespace(content=list(content), usage=usage)
+
+
+def _tool_use(tool_input):
+    return SimpleNamespace(type="tool_use", name="emit", input=tool_input)
+
+
+def _text(text):
+    return SimpleNamespace(type="text", text=text)
+
+
+@pytest.fixture(scope="module")
+def valid_output_payload():
+    """Complete URL summarizer output, built once and shared read-only."""
+    return {
+        "url": "https://example.com",
+        "title": "Example Page",
+        "summary": "This is an example page for testing.",
+        "key_points": ["Point 1", "Point 2", "Point 3"],
+        "content_type": "article",
+        "word_count_estimate": 500,
+        "language": "en"
+    }
+
 
-from src.skills.base import BaseSkill, SkillResult, SkillErrorType
-from src.skills.url_summarizer import UrlSummarizerInput, UrlSummarizerOutput
+@pytest.fixture(scope="module")
+def missing_field_output_payload(valid_output_payload):
+    """Output with only url and title, missing the other required fields."""
+    return {key: valid_output_payload[key] for key in ("url", "title")}
 
 
 class TestSkillSchemas:
     """Test that skill schemas validate correctly."""
     
-    def test_url_summarizer_input_valid(self):
-        """Valid URL should pass validation."""
-        input_data = {"url": "https://example.com/page"}
-        validated = UrlSummarizerInput.model_validate(input_data)
-        assert str(validated.url) == "https://example.com/page"
+    @pytest.mark.parametrize("payload,error", [
+        ({"url": "https://example.com/page"}, None),
+        ({"url": "not-a-url"}, "url_parsing"),
+    ], ids=["valid", "bad-url"])
+    def test_url_summarizer_input(self, payload, error):
+        """Valid URL should pass validation, invalid URL should fail."""
+        if error is None:
+            validated = _IN_V.validate_python(payload)
+            assert validated.url.unicode_string() == _EXPECTED_STR
+        else:
+            with pytest.raises(ValidationError, match=error):
+                _IN_V.validate_python(payload)
     
-    def test_url_summarizer_input_invalid(self):
-        """Invalid URL should fail validation."""
-        input_data = {"url": "not-a-url"}
-        with pytest.raises(Exception):
-            UrlSummarizerInput.model_validate(input_data)
+    @pytest.mark.parametrize("payload_fixture,error", [
+        ("valid_output_payload", None),
+        ("missing_field_output_payload", "missing"),
+    ], ids=["valid", "missing-field"])
+    def test_url_summarizer_output(self, request, payload_fixture, error):
+        """Valid output should pass validation, missing required field should fail."""
+        payload = request.getfixturevalue(payload_fixture)
+        if error is None:
+            validated = _OUT_V.validate_python(payload)
+            assert validated.title == "Example Page"
+            assert len(validated.key_points) == 3
+        else:
+            with pytest.raises(ValidationError, match=error):
+                _OUT_V.validate_python(payload)
     
-    def test_url_summarizer_output_valid(self):
-        """Valid output should pass validation."""
-        output_data = {
-            "url": "https://example.com",
-            "title": "Example Page",
-            "summary": "This is an example page for testing.",
-            "key_points": ["Point 1", "Point 2", "Point 3"],
-            "content_type": "article",
-            "word_count_estimate": 500,
-            "language": "en"
-        }
-        validated = UrlSummarizerOutput.model_validate(output_data)
-        assert validated.title == "Example Page"
-        assert len(validated.key_points) == 3
+    def test_url_summarizer_output_construct(self, valid_output_payload):
+        """Trusted output data builds without running validators."""
+        constructed = UrlSummarizerOutput.model_construct(**valid_output_payload)
+        assert constructed.title == "Example Page"
+        assert len(constructed.key_points) == 3
+
+
+class TestUrlSummarizerContent:
+    """Test page text extraction before it is sent to Claude."""
     
-    def test_url_summarizer_output_missing_field(self):
-        """Missing required field should fail validation."""
-        output_data = {
-            "url": "https://example.com",
-            "title": "Example Page",
-            # missing other required fields
-        }
-        with pytest.raises(Exception):
-            UrlSummarizerOutput.model_validate(output_data)
-
-
-class TestSkillResult:
-    """Test SkillResult dataclass."""
+    def test_extract_text_drops_markup(self):
+        html = """<html><head><title>Example  Page</title><style>p { color: red; }</style></head>
+        <body><script>track();</script><p>Hello   <b>world</b></p></body></html>"""
+        assert extract_text(html) == "Example Page\n\nHello world"
     
-    def test_success_result(self):
-        result = SkillResult(
-            success=True,
-            output={"key": "value"},
-            tokens_used=100,
-            latency_ms=500
-        )
+    def test_extract_text_parses_only_html_budget(self):
+        html = "<p>" + "a" * MAX_HTML_CHARS + "</p><p>past the budget</p>"
+        assert "past the budget" not in extract_text(html)
+
+
+class TestClaudeResponseParsing:
+    """Test turning Claude replies into SkillResults, tool and text paths."""
+    
+    def test_tool_response_valid(self, valid_output_payload):
+        result = _parse_tool_response(_stub_response(_tool_use(valid_output_payload)), UrlSummarizerOutput)
         assert result.success
-        assert result.error_type is None
+        assert result.output == valid_output_payload
+        assert result.tokens_used == 120
     
-    def test_failure_result(self):
-        result = SkillResult(
-            success=False,
-            output=None,
-            error_type=SkillErrorType.VALIDATION_INPUT,
-            error_message="Invalid input"
+    def test_tool_response_schema_invalid(self, missing_field_output_payload):
+        result = _parse_tool_response(
+            _stub_response(_tool_use(missing_field_output_payload)), UrlSummarizerOutput
         )
         assert not result.success
-        assert result.error_type == SkillErrorType.VALIDATION_INPUT
+        assert result.error_type == SkillErrorType.VALIDATION_OUTPUT
+        assert result.output == missing_field_output_payload
+    
+    def test_tool_response_without_tool_call(self):
+        result = _parse_tool_response(_stub_response(_text("Here is the summary.")), UrlSummarizerOutput)
+        assert not result.success
+        assert result.error_type == SkillErrorType.VALIDATION_OUTPUT
+        assert "emit" in result.error_message
+    
+    def test_text_response_fenced_json(self, valid_output_payload):
+        text = f"```json\n{json.dumps(valid_output_payload)}\n```"
+        result = _parse_text_response(_stub_response(_text(text)), UrlSummarizerOutput)
+        assert result.success
+        assert result.output == valid_output_payload
+    
+    def test_text_response_invalid_json(self):
+        result = _parse_text_response(_stub_response(_text("{not json")), UrlSummarizerOutput)
+        assert not result.success
+        assert result.error_type == SkillErrorType.VALIDATION_OUTPUT
+        assert result.output == {"raw_response": "{not json"}